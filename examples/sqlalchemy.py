@@ -30,7 +30,8 @@ from pyramid_resourceful.sqlalchemy import (
 from sqlalchemy import insert
 from sqlalchemy.engine import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.schema import Column
 from sqlalchemy.types import Integer, String
 
@@ -59,16 +60,38 @@ class Item(Base):
         return f"Item(id={self.id}, title={self.title}, description={self.description})"
 
 
+INSERT_ITEM = insert(Item.__table__)
+
 
 def main(global_config, **settings):
     def get_request_session(request):
         """Get managed session for current request."""
-        session = session_factory()
-        zope.sqlalchemy.register(session, transaction_manager=request.tm)
-        return session
+        return Session()
+
+    # NOTE: SQLite file connections are pooled rather than opened and
+    #       closed per request, so they have to be shareable across the
+    #       server's worker threads.
+    engine = create_engine(
+        f"sqlite:///{settings['db.path']}",
+        future=True,
+        logging_name="example",
+        echo_pool=False,
+        query_cache_size=1200,
+        poolclass=QueuePool,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        connect_args={"check_same_thread": False},
+    )
+
+    # The session registry is thread-local and is registered with the
+    # (thread-local) transaction manager used by pyramid_tm once here
+    # instead of on every request. The session is closed when the
+    # request's transaction ends, so it's safe to reuse it for the next
+    # request handled by the same thread.
+    Session = scoped_session(sessionmaker(bind=engine, future=True))
+    zope.sqlalchemy.register(Session)
 
-    engine = create_engine(f"sqlite:///{settings['db.path']}", future=True)
-    session_factory = sessionmaker(bind=engine, future=True)
     create_and_populate_database(engine)
 
     config = Configurator(settings=settings)
@@ -130,15 +153,13 @@ def main(global_config, **settings):
 
 
 def create_and_populate_database(engine):
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
-    statement = insert(Item.__table__).values(
-        (
-            {"title": "One", "description": "First"},
-            {"title": "Two", "description": "Second"},
-            {"title": "Three", "description": "Third"},
-        )
-    )
-    with engine.connect() as cxn:
-        cxn.execute(statement)
-        cxn.commit()
+    rows = [
+        {"title": "One", "description": "First"},
+        {"title": "Two", "description": "Second"},
+        {"title": "Three", "description": "Third"},
+    ]
+    # Drop, create, and populate using a single connection/transaction.
+    with engine.begin() as cxn:
+        Base.metadata.drop_all(bind=cxn)
+        Base.metadata.create_all(bind=cxn)
+        cxn.execute(INSERT_ITEM, rows)
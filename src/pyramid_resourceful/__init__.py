@@ -12,7 +12,13 @@ __all__ = [
 __version__ = "1.0a2"
 
 
+# Config directives added by includeme() as (name, method)
+_DIRECTIVES = tuple(
+    (name, getattr(config_module, name)) for name in config_module.__all__
+)
+
+
 def includeme(config):
-    for name in config_module.__all__:
-        method = getattr(config_module, name)
-        config.add_directive(name, method)
+    add_directive = config.add_directive
+    for name, method in _DIRECTIVES:
+        add_directive(name, method)
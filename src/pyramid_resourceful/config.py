@@ -1,5 +1,5 @@
+import functools
 import logging
-import posixpath
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import date, datetime
@@ -11,9 +11,16 @@ from pyramid.events import NewRequest, NewResponse
 from pyramid.interfaces import IRendererFactory
 
 from .cors import add_cors_headers
+from .renderers import JSONRenderer
 from .response import exception_response
 from .settings import get_setting
-from .util import NOT_SET, merge_dicts, obj_name_to_route_name, route_name_to_path
+from .util import (
+    NOT_SET,
+    join_path,
+    merge_dicts,
+    obj_name_to_route_name,
+    route_name_to_path,
+)
 from .view import ResourceView
 
 
@@ -30,17 +37,30 @@ __all__ = [
 log = logging.getLogger(__name__)
 
 
-RENDERER_EXT_MAP = {
-    "jinja2": "html",
-    "mako": "html",
+RENDERER_INFO = {
+    "csv": ("csv", "text/csv"),
+    "html": ("html", "text/html"),
+    "jinja2": ("html", "text/html"),
+    "json": ("json", "application/json"),
+    "mako": ("html", "text/html"),
 }
+"""Map of renderer names/extensions to route extension & Accept type."""
 
 
-RENDERER_ACCEPT_MAP = {
-    "csv": "text/csv",
-    "json": "application/json",
-    "html": "text/html",
-}
+def _isoformat_adapter(obj, _request):
+    return obj.isoformat()
+
+
+def _str_adapter(obj, _request):
+    return str(obj)
+
+
+DEFAULT_JSON_ADAPTERS = (
+    (date, _isoformat_adapter),
+    (datetime, _isoformat_adapter),
+    (Decimal, _str_adapter),
+)
+"""Default JSON adapters added by :func:`add_json_adapters`."""
 
 
 @dataclass
@@ -54,6 +74,31 @@ class AddResourceInfo:
     view: type
 
 
+class ResourceFactory:
+    """Route factory that creates a configured resource per request.
+
+    This is used as the ``factory`` for the routes generated by
+    :func:`add_resource`. It's called for every request matching one of
+    those routes.
+
+    """
+
+    __slots__ = ("resource_factory", "resource_args", "acl", "allowed_methods")
+
+    def __init__(self, resource_factory, resource_args, acl, allowed_methods):
+        self.resource_factory = resource_factory
+        self.resource_args = resource_args
+        self.acl = acl
+        self.allowed_methods = allowed_methods
+
+    def __call__(self, request):
+        resource = self.resource_factory(request, **self.resource_args)
+        if self.acl is not NOT_SET:
+            resource.__acl__ = self.acl
+        resource.allowed_methods = self.allowed_methods
+        return resource
+
+
 def add_json_adapter(self: Configurator, adapter):
     """Add a JSON adapter."""
     type_, adapter = adapter
@@ -72,16 +117,22 @@ def add_json_adapters(self: Configurator, *adapters):
 
     Also adds additional adapters if specified.
 
+    If the configured JSON renderer isn't already a
+    :class:`pyramid_resourceful.renderers.JSONRenderer`, it's replaced
+    with one (retaining its serializer, options, and any adapters that
+    were already added). This renderer resolves adapters registered for
+    concrete types with a single dict lookup.
+
     .. note:: If you don't want the defaults, use
         :func:`add_json_adapter` instead.
 
     """
-    renderer = self.registry.getUtility(IRendererFactory, "json")
-    adapters = (
-        (date, lambda obj, req: obj.isoformat()),
-        (datetime, lambda obj, req: obj.isoformat()),
-        (Decimal, lambda obj, req: str(obj)),
-    ) + adapters
+    registry = self.registry
+    renderer = registry.getUtility(IRendererFactory, "json")
+    if not isinstance(renderer, JSONRenderer):
+        renderer = JSONRenderer.from_renderer(renderer)
+        registry.registerUtility(renderer, IRendererFactory, "json")
+    adapters = DEFAULT_JSON_ADAPTERS + adapters
     for type_, adapter in adapters:
         renderer.add_adapter(type_, adapter)
 
@@ -224,6 +275,14 @@ def add_resource(
     """
     resource_class = self.maybe_dotted(resource_class)
 
+    # Avoid building debug messages when they won't be logged
+    debug = log.isEnabledFor(logging.DEBUG)
+
+    settings = self.get_settings()
+    default_acl = get_setting(settings, "default_acl")
+    resource_methods = get_setting(settings, "resource_methods")
+    resource_methods = tuple(m.lower() for m in resource_methods)
+
     if resource_args is None:
         resource_args = {}
 
@@ -257,7 +316,7 @@ def add_resource(
     if path_prefix is not None:
         log.debug("Prepending path prefix %s to route pattern: %s", path_prefix, path)
         if path:
-            path = posixpath.join(path_prefix, path.lstrip("/"))
+            path = join_path(path_prefix, path.lstrip("/"))
         else:
             # Path can be "" to indicate root of prefixed routes
             path = path_prefix
@@ -265,11 +324,14 @@ def add_resource(
     if segments:
         if isinstance(segments, str):
             segments = (segments,)
-        log.debug("Appending path segment(s) to route pattern: %s", ", ".join(segments))
-        path = posixpath.join(path, *segments)
+        if debug:
+            log.debug(
+                "Appending path segment(s) to route pattern: %s", ", ".join(segments)
+            )
+        path = join_path(path, *segments)
 
     if acl is NOT_SET and getattr(resource_class, "__acl__", NOT_SET) is NOT_SET:
-        acl = get_setting(self.get_settings(), "default_acl")
+        acl = default_acl
         if acl is not NOT_SET:
             log.debug("Using default ACL for resource: %s", resource_name)
 
@@ -280,81 +342,52 @@ def add_resource(
     if permission:
         view_args["permission"] = permission
 
-    method_config = []
-    methods_not_allowed = []
-    resource_methods = get_setting(self.get_settings(), "resource_methods")
-    resource_methods = tuple(m.lower() for m in resource_methods)
-
-    def add_method_config(resource_class_, method):
-        attr = method.lower()
-        if not hasattr(resource_class, attr):
-            return None
-        if not hasattr(view, attr):
-            raise ConfigurationError(
-                f"View has no method {attr!r} corresponding to "
-                f"resource method {attr!r}: {view_name}"
-            )
-        request_method = attr.upper()
-        resource_method = getattr(resource_class_, attr)
-        resource_config = getattr(resource_method, "resource_config", None)
-        config = (attr, request_method, resource_config)
-        method_config.append(config)
-        return config
+    method_config, found_methods, methods_not_allowed = _inspect_resource(
+        resource_class, view, resource_methods
+    )
 
     if allowed_methods:
-        # Inspect resource class and find the specified allowed methods.
+        # Restrict to the specified allowed methods, which must exist on
+        # the resource class.
         allowed_methods = tuple(m.upper() for m in allowed_methods)
         for method in allowed_methods:
-            config = add_method_config(resource_class, method)
-            if config is None:
+            if method not in found_methods:
                 raise ConfigurationError(
                     f"The specified allowed method {method!r} does not exist on "
                     f"resource: {resource_name}"
                 )
-        methods_not_allowed = [
-            m.upper() for m in resource_methods if m not in allowed_methods
-        ]
+        method_config = tuple(c for c in method_config if c[1] in allowed_methods)
+        methods_not_allowed = tuple(
+            m.upper() for m in resource_methods if m.upper() not in allowed_methods
+        )
     else:
-        # Inspect resource class and find methods based on configured
-        # resource methods.
-        allowed_methods = []
-        for method in resource_methods:
-            config = add_method_config(resource_class, method)
-            if config is None:
-                methods_not_allowed.append(method.upper())
-            else:
-                attr, request_method, _ = config
-                allowed_methods.append(request_method)
+        allowed_methods = found_methods
 
     if not allowed_methods:
         raise ConfigurationError(
             f"No resource methods found for resource: {resource_name}"
         )
 
-    if methods_not_allowed:
+    if debug and methods_not_allowed:
         log.debug(
             "Resource %s does not allow these methods: %s",
             resource_name,
             ", ".join(methods_not_allowed),
         )
 
-    def factory(request):
-        resource = resource_factory(request, **resource_args)
-        if acl is not NOT_SET:
-            resource.__acl__ = acl
-        resource.allowed_methods = allowed_methods
-        return resource
+    factory = ResourceFactory(resource_factory, resource_args, acl, allowed_methods)
 
     def add_route(route_name, pattern, accept: List[str] = None):
-        log.debug(
-            "Adding route '%s' with pattern '%s' for resource '%s' "
-            "responding to %s accepting content type %s",
-            route_name,
-            pattern,
-            resource_name,
-            {", ".join(allowed_methods)},
-            {", ".join(accept) if accept else "ANY"},
-        )
+        if debug:
+            log.debug(
+                "Adding route '%s' with pattern '%s' for resource '%s' "
+                "responding to %s accepting content type %s",
+                route_name,
+                pattern,
+                resource_name,
+                ", ".join(allowed_methods),
+                ", ".join(a for a in accept if a) if accept else "ANY",
+            )
         self.add_route(
             route_name,
             pattern,
@@ -369,18 +402,20 @@ def add_resource(
             if view_config:
                 args = {**view_config.view_args, **view_args}
             else:
-                args = {**view_args}
-
-            log.debug(
-                "Adding view '%s.%s' for route '%s' responding to %s "
-                "accepting content type %s with renderer %s",
-                view_name,
-                attr,
-                route_name,
-                request_method,
-                accept or "ANY",
-                renderer,
-            )
+                # No need to copy since the args are unpacked below
+                args = view_args
+
+            if debug:
+                log.debug(
+                    "Adding view '%s.%s' for route '%s' responding to %s "
+                    "accepting content type %s with renderer %s",
+                    view_name,
+                    attr,
+                    route_name,
+                    request_method,
+                    accept or "ANY",
+                    renderer,
+                )
 
             self.add_view(
                 route_name=route_name,
@@ -400,23 +435,23 @@ def add_resource(
                 accept=accept,
             )
 
-    accepts = []
+    # (renderer, accept, route name, route pattern) for each renderer
+    renderer_config = []
+    for renderer in renderers:
+        ext, accept = get_ext_and_accept_for_renderer(renderer)
+        renderer_config.append((renderer, accept, f"{name}.{ext}", f"{path}.{ext}"))
 
     # Add route with extension for each renderer. In this case, the
     # accepted renderer is specified by the extension in the URL path
     # (and the Accept header is ignored).
-    for renderer in renderers:
-        ext, accept = get_ext_and_accept_for_renderer(renderer)
-        accepts.append(accept)
-        route_name = f"{name}.{ext}"
-        pattern = f"{path}.{ext}"
+    for renderer, _, route_name, pattern in renderer_config:
         add_route(route_name, pattern)
         add_views(route_name, renderer)
 
     # Add route without extension for all renderers. In this case, the
     # accepted renderer is specified by the Accept header.
-    add_route(name, path, accepts)
-    for accept, renderer in zip(accepts, renderers):
+    add_route(name, path, [accept for _, accept, _, _ in renderer_config])
+    for renderer, accept, _, _ in renderer_config:
         add_views(name, renderer, accept)
 
     return AddResourceInfo(
@@ -468,8 +503,13 @@ def add_resources(
         add_method = self.add_resource
 
     def add(*args, resource_args=None, **kwargs):
-        resource_args = merge_dicts(parent_resource_args, resource_args)
-        kwargs = {**add_kwargs, **kwargs}
+        # Only merge when there's something to merge
+        if not resource_args:
+            resource_args = parent_resource_args
+        elif parent_resource_args:
+            resource_args = merge_dicts(parent_resource_args, resource_args)
+        if add_kwargs:
+            kwargs = {**add_kwargs, **kwargs}
         return add_method(
             *args,
             resource_args=resource_args,
@@ -547,40 +587,84 @@ def enable_post_tunneling(
     from the request, and the application will never see them.
 
     """
-    allowed_methods = sorted(allowed_methods)
+    # The sorted list is only used for the error message
+    allowed_list = sorted(allowed_methods)
+    allowed_set = frozenset(allowed_list)
     disallowed_message = (
-        f"Only these methods may be tunneled over POST: {allowed_methods}."
+        f"Only these methods may be tunneled over POST: {allowed_list}."
     )
 
     def new_request_subscriber(event):
         request = event.request
-        if request.method == "POST":
-            if param_name in request.GET:
-                method = request.GET[param_name]
-            elif param_name in request.POST:
-                method = request.POST[param_name]
-            elif header_name in request.headers:
-                method = request.headers[header_name]
-            else:
-                return  # Not a tunneled request
-            if method in allowed_methods:
-                request.GET.pop(param_name, None)
-                request.POST.pop(param_name, None)
-                request.headers.pop(header_name, None)
-                request.method = method
-            else:
-                raise exception_response(405, detail=disallowed_message)
+        if request.method != "POST":
+            return
+        # The param and header are always removed so the app never
+        # sees them. The query param is preferred over the POST param,
+        # which is preferred over the header.
+        # NOTE: For non-form requests (e.g., JSON), request.POST is a
+        #       NoVars instance, which doesn't support pop().
+        method = request.GET.pop(param_name, None)
+        post = request.POST
+        post_method = post.pop(param_name) if param_name in post else None
+        header_method = request.headers.pop(header_name, None)
+        if method is None:
+            method = header_method if post_method is None else post_method
+        if method is None:
+            return  # Not a tunneled request
+        if method not in allowed_set:
+            raise exception_response(405, detail=disallowed_message)
+        request.method = method
 
     self.add_subscriber(new_request_subscriber, NewRequest)
 
 
+@functools.lru_cache(maxsize=None)
+def _inspect_resource(resource_class, view, resource_methods):
+    """Find the resource methods implemented by a resource class.
+
+    The result is cached so that a resource class that's registered
+    multiple times (e.g., under different prefixes) is only inspected
+    once.
+
+    Returns:
+        tuple: The method config for each implemented method as
+            ``(attr, request_method, resource_config)``, the request
+            methods that are implemented, and the request methods that
+            aren't.
+
+    """
+    # Collect class attributes up front rather than probing with
+    # hasattr(), which could trigger __getattr__ side effects.
+    class_attrs = set()
+    for cls in resource_class.__mro__:
+        class_attrs.update(vars(cls))
+    method_config = []
+    allowed_methods = []
+    methods_not_allowed = []
+    for attr in resource_methods:
+        request_method = attr.upper()
+        if attr not in class_attrs:
+            methods_not_allowed.append(request_method)
+            continue
+        if not hasattr(view, attr):
+            raise ConfigurationError(
+                f"View has no method {attr!r} corresponding to "
+                f"resource method {attr!r}: {view.__name__}"
+            )
+        resource_method = getattr(resource_class, attr)
+        resource_config = getattr(resource_method, "resource_config", None)
+        method_config.append((attr, request_method, resource_config))
+        allowed_methods.append(request_method)
+    return tuple(method_config), tuple(allowed_methods), tuple(methods_not_allowed)
+
+
+@functools.lru_cache(maxsize=32)
 def get_ext_and_accept_for_renderer(renderer):
     if "." in renderer:
         ext = renderer.rsplit(".", 1)[1]
     else:
         ext = renderer
-    ext = RENDERER_EXT_MAP.get(ext, ext)
-    return ext, RENDERER_ACCEPT_MAP.get(ext)
+    return RENDERER_INFO.get(ext, (ext, None))
 
 
 def method_not_allowed_view(request):
@@ -1,9 +1,12 @@
 import csv
 import io
+import json
 from typing import Mapping
 
+from pyramid.renderers import JSON
 
-__all__ = ["CSVRenderer"]
+
+__all__ = ["CSVRenderer", "JSONRenderer"]
 
 
 class CSVRenderer:
@@ -35,3 +38,54 @@ class CSVRenderer:
             return file.getvalue()
 
         return _render
+
+
+class JSONRenderer(JSON):
+    """Render view result to JSON, with fast adapter lookup by type.
+
+    Pyramid's JSON renderer looks up adapters in a component registry
+    for every object that can't be serialized natively. This renderer
+    also keeps the adapters that are registered for concrete types in
+    a dict so that objects of *exactly* those types can be adapted with
+    a single lookup. Anything else (subclasses, interfaces, objects with
+    a ``__json__`` method) falls back to the standard lookup.
+
+    """
+
+    def __init__(self, serializer=json.dumps, adapters=(), **kw):
+        self.type_adapters: dict = {}
+        super().__init__(serializer, adapters, **kw)
+
+    @classmethod
+    def from_renderer(cls, renderer: JSON) -> "JSONRenderer":
+        """Create from an existing JSON renderer.
+
+        The existing renderer's serializer, serializer options, and
+        adapters are retained.
+
+        """
+        new_renderer = cls(renderer.serializer, **renderer.kw)
+        new_renderer.components = renderer.components
+        return new_renderer
+
+    def add_adapter(self, type_or_iface, adapter):
+        super().add_adapter(type_or_iface, adapter)
+        if isinstance(type_or_iface, type):
+            self.type_adapters[type_or_iface] = adapter
+
+    # NOTE: This overrides a private method of Pyramid's JSON renderer
+    #       and may need to be updated when upgrading Pyramid.
+    def _make_default(self, request):
+        type_adapters = self.type_adapters
+        fallback = super()._make_default(request)
+
+        def default(obj):
+            # Like Pyramid, prefer __json__ over registered adapters
+            if hasattr(obj, "__json__"):
+                return fallback(obj)
+            adapter = type_adapters.get(obj.__class__)
+            if adapter is not None:
+                return adapter(obj, request)
+            return fallback(obj)
+
+        return default
@@ -1,3 +1,4 @@
+import functools
 from typing import Any, Callable, Dict, List
 
 from pyramid.config import ConfigurationError
@@ -61,22 +62,28 @@ Used to determine how to convert settings values.
 """
 
 
+RESOLVER = DottedNameResolver()
+
+
+@functools.lru_cache(maxsize=256)
+def resolve_dotted_name(name: str) -> Any:
+    """Resolve dotted name to object, caching the result."""
+    return RESOLVER.maybe_resolve(name)
+
+
+CONVERTERS: Dict[Any, Callable[[str], Any]] = {
+    bool: asbool,
+    Callable[..., Any]: resolve_dotted_name,
+    List: aslist,
+    Any: resolve_dotted_name,
+}
+"""Converters for string setting values by type (see :data:`TYPES`)."""
+
+
 def convert_setting(name, value):
     """Convert setting value according to its defined type."""
     if isinstance(value, str):
-        type_ = TYPES[name]
-        if type_ is bool:
-            converter = asbool
-        elif type_ is Callable[..., Any]:
-            resolver = DottedNameResolver()
-            converter = resolver.maybe_resolve
-        elif type_ is List:
-            converter = aslist
-        elif type_ is Any:
-            resolver = DottedNameResolver()
-            converter = resolver.maybe_resolve
-        else:
-            converter = None
+        converter = CONVERTERS.get(TYPES[name])
         if converter is not None:
             value = converter(value)
     return value
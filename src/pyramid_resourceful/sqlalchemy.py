@@ -1,12 +1,13 @@
+import functools
 import json
-from collections import namedtuple
-from math import ceil as ceiling
+import re
+from types import MappingProxyType
+from weakref import WeakKeyDictionary
 
-from pyramid.httpexceptions import HTTPNotFound
+from pyramid.decorator import reify
 
-from sqlalchemy import inspect
-from sqlalchemy.orm import joinedload
-from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy import func, inspect
+from sqlalchemy.orm import Bundle, joinedload, raiseload, selectinload
 from sqlalchemy.sql import and_, or_
 
 from .response import exception_response
@@ -17,7 +18,120 @@ from .util import NOT_SET, extract_data, get_param, is_sequence
 from .resource import Resource
 
 
-class FilterSpec(namedtuple("FilterSpec", "operator value")):
+LOADERS = {
+    "joined": joinedload,
+    "selectin": selectinload,
+}
+"""Eager loading strategies that can be used with ``joined_load_with``."""
+
+
+BOOLEAN_OPERATORS = {
+    "and": and_,
+    "or": or_,
+}
+"""Boolean operators that can be used to combine filters."""
+
+
+WINDOW_COUNT_LABEL = "__count"
+"""Label of the count column added for window function pagination."""
+
+
+JSON_IDENTIFIERS = frozenset(("true", "false", "null", "NaN", "Infinity"))
+"""Identifier-like strings that :func:`json.loads` *does* parse."""
+
+
+IDENTIFIER_RE = re.compile(r"^[A-Za-z_][\w-]*$")
+
+
+def is_plain_identifier(value):
+    """Is the value an identifier-like string that isn't JSON?
+
+    Values like this (e.g., a slug from a URL) would only cause
+    :func:`json.loads` to raise an error, so they can be used as is.
+
+    """
+    return value not in JSON_IDENTIFIERS and IDENTIFIER_RE.match(value) is not None
+
+
+def parse_page_size(value):
+    """Parse page size, returning ``None`` for "*" (all items)."""
+    if value == "*":
+        return None
+    return int(value)
+
+
+_column_attrs_cache: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def get_column_attrs(model):
+    """Get the names of the column attributes of a model.
+
+    These are cached per model class since they don't change after the
+    model's mapper is configured.
+
+    """
+    try:
+        return _column_attrs_cache[model]
+    except KeyError:
+        column_attrs = tuple(attr.key for attr in inspect(model).column_attrs)
+        _column_attrs_cache[model] = column_attrs
+        return column_attrs
+
+
+@functools.lru_cache(maxsize=256)
+def parse_fields(fields):
+    """Parse field names into a plan for extracting them from items.
+
+    ``fields`` is a frozenset of field names, which may be dotted to
+    refer to fields of related objects (e.g., ``author.name``). The
+    plan is a tuple of ``(name, sub_fields)`` pairs, one per distinct
+    top level name, where ``sub_fields`` is a frozenset containing the
+    rest of each dotted name starting with ``name`` or ``None`` if
+    there aren't any. For example, ``author.name`` and ``author.email``
+    are grouped as ``("author", {"name", "email"})`` so that the author
+    is only retrieved once per item.
+
+    If a name is specified both by itself and with sub-fields, only the
+    sub-fields are extracted.
+
+    Plans are cached, so parsing happens once per distinct set of
+    fields rather than once per item.
+
+    """
+    grouped: dict = {}
+    for field in fields:
+        name, *rest = field.split(".", 1)
+        sub_fields = grouped.setdefault(name, set())
+        sub_fields.update(rest)
+    return tuple(
+        (name, frozenset(sub_fields) if sub_fields else None)
+        for name, sub_fields in grouped.items()
+    )
+
+
+class FilterSpec:
+
+    """Filter operator (e.g., ``__eq__``) and value.
+
+    Filter specs are created per request, so they're modified in place
+    (e.g., when converting values) rather than being copied.
+
+    """
+
+    __slots__ = ("operator", "value")
+
+    def __init__(self, operator, value):
+        self.operator = operator
+        self.value = value
+
+    def __eq__(self, other):
+        if not isinstance(other, FilterSpec):
+            return NotImplemented
+        return self.operator == other.operator and self.value == other.value
+
+    def __repr__(self):
+        return f"FilterSpec(operator={self.operator!r}, value={self.value!r})"
+
     def clone(self, operator=NOT_SET, value=NOT_SET):
         if operator is NOT_SET:
             operator = self.operator
@@ -40,10 +154,30 @@ class SQLAlchemyResource(Resource):
         base_query: Base SQLAlchemy query. If not specified, this will be
             set to ``request.dbsession.query(model)``.
 
-        joined_load_with: Entities to load in the same query. Note that
-            func:`sqlalchemy.orm.joinedload` is used to load these
-            entities. For complex query logic, this might not be
-            suitable.
+        joined_load_with: Entities to load eagerly along with the
+            queried items. Each entry can be an entity or an
+            ``(entity, strategy)`` tuple, where ``strategy`` is one of
+            the :data:`LOADERS` ("joined" or "selectin"), to override
+            ``loader_strategy`` for that entity. For complex query
+            logic, this might not be suitable.
+
+        loader_strategy: The default strategy for loading the entities
+            in ``joined_load_with``. Defaults to "selectin", which uses
+            :func:`sqlalchemy.orm.selectinload` to load related entities
+            with a separate ``SELECT ... IN`` query. This avoids
+            duplicating parent rows for one-to-many relationships, as
+            :func:`sqlalchemy.orm.joinedload` ("joined") does. "joined"
+            is generally only preferable for many-to-one relationships.
+
+        populate_existing: If set, objects already present in the
+            session will be refreshed from the query results when
+            eager loading. This is off by default.
+
+        raise_on_lazy_load: If set, lazy loading of *any* relationship
+            will raise an error. This is intended for use in
+            development and tests to catch relationships that are
+            accessed when generating responses but aren't eagerly
+            loaded via ``joined_load_with``.
 
         filters_to_skip: Filters that should be skipped by
             :meth:`apply_filters`. The intent behind this is to specify
@@ -57,8 +191,13 @@ class SQLAlchemyResource(Resource):
 
     """
 
-    base_query = None
+    # Filter operations by (model, column name, operator name)
+    _operator_cache: dict = {}
+
     joined_load_with = ()
+    loader_strategy = "selectin"
+    populate_existing = False
+    raise_on_lazy_load = False
     filters_to_skip = ()
     filter_converters = ()
 
@@ -71,50 +210,72 @@ class SQLAlchemyResource(Resource):
         joined_load_with=None,
         filters_to_skip=None,
         filter_converters=None,
+        loader_strategy=None,
+        populate_existing=None,
+        raise_on_lazy_load=None,
         # NOTE: ALL subclass args needs to be passed up
         **kwargs,
     ):
         super().__init__(request)
 
         cls = self.__class__
-        dbsession = request.dbsession
-        settings = request.registry.settings
 
         if model is None:
             model = cls.model
         if key is None:
             key = cls.key
-        if base_query is None:
-            base_query = cls.base_query or dbsession.query(model)
         if joined_load_with is None:
             joined_load_with = cls.joined_load_with
         if filters_to_skip is None:
             filters_to_skip = cls.filters_to_skip
         if filter_converters is None:
             filter_converters = cls.filter_converters
+        if loader_strategy is None:
+            loader_strategy = cls.loader_strategy
+        if populate_existing is None:
+            populate_existing = cls.populate_existing
+        if raise_on_lazy_load is None:
+            raise_on_lazy_load = cls.raise_on_lazy_load
 
         self.model = model
         self.key = key
-        self.base_query = base_query
+        if base_query is not None:
+            self.base_query = base_query
         self.joined_load_with = joined_load_with
         self.filters_to_skip = filters_to_skip
         self.filter_converters = filter_converters
+        self.loader_strategy = loader_strategy
+        self.populate_existing = populate_existing
+        self.raise_on_lazy_load = raise_on_lazy_load
 
         for name, value in kwargs.items():
             if value is None:
                 value = getattr(cls, name)
             setattr(self, name, value)
 
-        model_info = inspect(self.model)
-
-        self.dbsession = dbsession
-        self.default_response_fields_getter = get_setting(
-            settings, "get_default_response_fields"
-        )
-        self.item_processor = get_setting(settings, "item_processor")
-        self.column_attrs = tuple(attr.key for attr in model_info.column_attrs)
+        self.dbsession = request.dbsession
+        self.column_attrs = get_column_attrs(self.model)
         self.default_response_fields = self.column_attrs
 
+    @reify
+    def base_query(self):
+        """Base query; defaults to ``dbsession.query(model)``.
+
+        This is created on first access so it's not created for
+        requests that don't query (e.g., ``POST`` to a container).
+
+        """
+        return self.dbsession.query(self.model)
+
+    @reify
+    def default_response_fields_getter(self):
+        settings = self.request.registry.settings
+        return get_setting(settings, "get_default_response_fields")
+
+    @reify
+    def item_processor(self):
+        return get_setting(self.request.registry.settings, "item_processor")
+
     def get_filters(self, *, params=None, converter=json.loads):
         """Get filters from request."""
         return {}
@@ -131,7 +292,7 @@ class SQLAlchemyResource(Resource):
                         value = value.__class__(converter(v) for v in value)
                     else:
                         value = converter(value)
-                    filters[name] = spec.clone(value=value)
+                    spec.value = value
         return filters
 
     def apply_filters(self, q, *, skip_filters=()):
@@ -139,7 +300,7 @@ class SQLAlchemyResource(Resource):
 
         See :meth:`get_filters` for how filters are specified. By
         default, filters are ANDed together. This can be overridden by
-        specifying `$operator=or` in the request's parameters.
+        specifying ``"$operator": "or"`` in the filters.
 
         """
         filters = self.get_filters()
@@ -148,43 +309,121 @@ class SQLAlchemyResource(Resource):
             return q
 
         filters = self.convert_filters(filters, self.filter_converters)
-        model = self.model
-        operations = []
-        boolean_operator = filters.pop("$operator", "and").lower()
-
-        for name, spec in filters.items():
-            if name in skip_filters or name in self.filters_to_skip:
-                continue
-            try:
-                col = getattr(model, name)
-            except AttributeError:
-                raise exception_response(
-                    400,
-                    detail=f"Unknown column on model {model.__name__}: {name}",
-                )
-            operator = getattr(col, spec.operator)
-            operations.append(operator(spec.value))
-
-        if boolean_operator == "and":
-            q = q.filter(and_(*operations))
-        elif boolean_operator == "or":
-            q = q.filter(or_(*operations))
+        boolean_operator = filters.get("$operator", "and")
+        if isinstance(boolean_operator, str):
+            combine = BOOLEAN_OPERATORS.get(boolean_operator.lower())
         else:
+            combine = None
+
+        if combine is None:
             raise exception_response(
                 400,
                 detail=f"Unsupported boolean operator: {boolean_operator}",
             )
 
+        filters_to_skip = self.filters_to_skip
+        get_operation = self.get_filter_operation
+        operations = tuple(
+            get_operation(name, spec.operator)(spec.value)
+            for name, spec in filters.items()
+            if name != "$operator"
+            and name not in skip_filters
+            and name not in filters_to_skip
+        )
+
+        if operations:
+            q = q.filter(combine(*operations))
+
         return q
 
-    def apply_options(self, q):
-        """Apply options to query."""
+    def get_filter_operation(self, name, operator):
+        """Get filter operation for column ``name`` and ``operator``.
+
+        Operations are cached by model, column name, and operator name.
+
+        """
+        model = self.model
+        key = (model, name, operator)
+        try:
+            return self._operator_cache[key]
+        except KeyError:
+            pass
+        col = getattr(model, name, None)
+        if col is None:
+            raise exception_response(
+                400,
+                detail=f"Unknown column on model {model.__name__}: {name}",
+            )
+        operation = getattr(col, operator)
+        self._operator_cache[key] = operation
+        return operation
+
+    def apply_options(self, q, *, requested_fields=None):
+        """Apply options to query.
+
+        Eager loading options are added for the entities in
+        ``joined_load_with`` using the configured ``loader_strategy``
+        unless a strategy is specified for a given entity.
+
+        If ``requested_fields`` is specified, it should be the set of
+        top level names of the fields that will be included in the
+        response (see :meth:`get_requested_fields`). Relationships
+        that won't be included in the response won't be loaded.
+
+        """
         if self.joined_load_with:
+            default_strategy = self.loader_strategy
             for item in self.joined_load_with:
-                q = q.options(joinedload(item))
-            q = q.populate_existing()
+                if isinstance(item, tuple):
+                    item, strategy = item
+                else:
+                    strategy = default_strategy
+                try:
+                    loader = LOADERS[strategy]
+                except KeyError:
+                    raise ValueError(f"Unknown loader strategy: {strategy!r}")
+                if requested_fields is not None:
+                    key = item if isinstance(item, str) else getattr(item, "key", None)
+                    if key is not None and key.split(".", 1)[0] not in requested_fields:
+                        continue
+                q = q.options(loader(item))
+            if self.populate_existing:
+                q = q.populate_existing()
+        if self.raise_on_lazy_load:
+            q = q.options(raiseload("*"))
         return q
 
+    def get_requested_fields(self):
+        """Get top level names of fields that will be in the response.
+
+        If this can't be determined up front because the response
+        fields may be computed per item, ``None`` is returned.
+
+        """
+        if not self._has_static_response_fields():
+            return None
+        fields = self.get_response_fields(None)
+        return {name.split(".", 1)[0] for name in fields}
+
+    def _has_static_response_fields(self):
+        """Are the response fields the same for every item?
+
+        This is only known to be the case when none of the per-item
+        hooks (:meth:`get_response_fields`,
+        :meth:`get_default_response_fields`, and :meth:`extract_fields`)
+        is overridden and no default response fields getter is
+        configured.
+
+        """
+        cls = type(self)
+        return (
+            self.default_response_fields_getter is None
+            and cls.get_response_fields is SQLAlchemyResource.get_response_fields
+            and cls.get_default_response_fields
+            is SQLAlchemyResource.get_default_response_fields
+            and cls.extract_fields is SQLAlchemyResource.extract_fields
+        )
+
     def get_response_fields(self, item):
         """Get fields to include in response.
 
@@ -210,18 +449,26 @@ class SQLAlchemyResource(Resource):
             fields=a,b,c
 
         """
-        request = self.request
-        specified = get_param(request, "field", multi=True, default=None)
-        specified = specified or get_param(request, "fields", list, default=None)
-        specified = specified or ["*"]
         fields = set()
-        for spec in specified:
+        for spec in self.specified_response_fields:
             if spec == "*":
                 fields.update(self.get_default_response_fields(item))
             else:
                 fields.add(spec)
         return fields
 
+    @reify
+    def specified_response_fields(self):
+        """Fields specified via request params (see above).
+
+        Defaults to ``["*"]`` if no fields are specified.
+
+        """
+        request = self.request
+        specified = get_param(request, "field", multi=True, default=None)
+        specified = specified or get_param(request, "fields", list, default=None)
+        return specified or ["*"]
+
     def get_default_response_fields(self, item):
         """Get default fields to include in response."""
         default_response_fields_getter = self.default_response_fields_getter
@@ -236,34 +483,28 @@ class SQLAlchemyResource(Resource):
         item is typically a dict.
 
         """
-        request = self.request
-
         if fields is None:
             fields = self.get_response_fields(item)
+        plan = parse_fields(frozenset(fields))
+        return self._extract_with_plan(item, plan)
 
+    def _extract_with_plan(self, item, plan):
+        # Extract fields from item according to plan from parse_fields()
+        request = self.request
+        extract = self._extract_with_plan
         new_item = {}
 
-        for name in fields:
-            name, *rest = name.split(".", 1)
+        for name, sub_fields in plan:
             obj = getattr(item, name)
             if callable(obj):
                 obj = obj(request)
-            if rest:
+            if sub_fields:
+                sub_plan = parse_fields(sub_fields)
                 if is_sequence(obj):
-                    result = [self.extract_fields(sub_obj, rest) for sub_obj in obj]
-                    if name in new_item:
-                        for i, sub_obj in enumerate(result):
-                            new_item[name][i].update(sub_obj)
-                    else:
-                        new_item[name] = result
-                else:
-                    result = self.extract_fields(obj, rest)
-                    if name in new_item:
-                        new_item[name].update(result)
-                    else:
-                        new_item[name] = result
-            else:
-                new_item[name] = obj
+                    obj = [extract(o, sub_plan) for o in obj]
+                elif obj is not None:
+                    obj = extract(obj, sub_plan)
+            new_item[name] = obj
 
         return new_item
 
@@ -289,28 +530,61 @@ class SQLAlchemyContainerResource(SQLAlchemyResource):
     - ``get`` -> Get all or a filtered subset of items
     - ``post`` -> Add a new item
 
+    The total number of items is included in the pagination data for
+    paginated requests. How it's computed is determined by
+    ``pagination_count_strategy``:
+
+    - "window" (default): The count is selected along with each item
+      using a window function (``COUNT(*) OVER ()``), so only a single
+      query is issued. The database must support window functions.
+
+    - "separate": The count is computed with a separate ``COUNT``
+      query before the page of items is fetched.
+
+    - "none": The count isn't computed. One extra item is fetched to
+      determine whether there's a next page. The ``count`` and
+      ``pages`` entries in the pagination data will be ``None``.
+
+    If ``stream_batch_size`` is set and pagination isn't used, items are
+    streamed from the database in batches of that size using
+    ``Query.yield_per`` rather than being loaded all at once. This isn't
+    done when any entities are eagerly loaded via ``joined_load_with``
+    using the "joined" strategy, since that's not compatible with
+    ``yield_per`` for collections.
+
+    .. note:: Streaming is disabled by default. Options on a custom
+        ``base_query`` aren't checked, so don't enable it when the base
+        query eagerly loads collections using ``joinedload()``.
+
+    If ``use_core_for_projection`` is set and only column attributes
+    will be included in the response, those columns are selected
+    directly instead of loading ORM instances (see
+    :meth:`get_projection`).
+
     """
 
     key = "items"
     item_key = "item"
 
     filtering_enabled = True
-    filtering_supported_operators = {
-        "=": "__eq__",
-        "!=": "__ne__",
-        "<": "__lt__",
-        "<=": "__le__",
-        ">": "__gt__",
-        ">=": "__ge__",
-        "in": "in_",
-        "not in": "notin_",
-        "like": "like",
-        "not like": "notlike",
-        "ilike": "ilike",
-        "not ilike": "notilike",
-        "is": "is_",
-        "is not": "isnot",
-    }
+    filtering_supported_operators = MappingProxyType(
+        {
+            "=": "__eq__",
+            "!=": "__ne__",
+            "<": "__lt__",
+            "<=": "__le__",
+            ">": "__gt__",
+            ">=": "__ge__",
+            "in": "in_",
+            "not in": "notin_",
+            "like": "like",
+            "not like": "notlike",
+            "ilike": "ilike",
+            "not ilike": "notilike",
+            "is": "is_",
+            "is not": "isnot",
+        }
+    )
 
     ordering_enabled = True
     ordering_default = ()
@@ -319,6 +593,16 @@ class SQLAlchemyContainerResource(SQLAlchemyResource):
     pagination_enabled = True
     pagination_default_page_size = 50
     pagination_max_page_size = 250
+    pagination_count_strategy = "window"
+
+    stream_batch_size = None
+
+    use_core_for_projection = False
+
+    # These are set by get() and apply_pagination() so that later
+    # steps know how the query was built.
+    _projection = None
+    _window_count_added = False
 
     def __init__(
         self,
@@ -329,6 +613,9 @@ class SQLAlchemyContainerResource(SQLAlchemyResource):
         joined_load_with=None,
         filters_to_skip=None,
         filter_converters=None,
+        loader_strategy=None,
+        populate_existing=None,
+        raise_on_lazy_load=None,
         # Container-specific args
         item_key=None,
         filtering_enabled=None,
@@ -338,6 +625,7 @@ class SQLAlchemyContainerResource(SQLAlchemyResource):
         pagination_enabled=None,
         pagination_default_page_size=None,
         pagination_max_page_size=None,
+        pagination_count_strategy=None,
     ):
         kwargs = dict(
             item_key=item_key,
@@ -348,6 +636,7 @@ class SQLAlchemyContainerResource(SQLAlchemyResource):
             pagination_enabled=pagination_enabled,
             pagination_default_page_size=pagination_default_page_size,
             pagination_max_page_size=pagination_max_page_size,
+            pagination_count_strategy=pagination_count_strategy,
         )
         super().__init__(
             request,
@@ -357,30 +646,92 @@ class SQLAlchemyContainerResource(SQLAlchemyResource):
             joined_load_with,
             filters_to_skip,
             filter_converters,
+            loader_strategy,
+            populate_existing,
+            raise_on_lazy_load,
             **kwargs,
         )
 
     def get(self, *, wrapped=True):
         """Get items in container."""
         data = {}
+        pagination_data = None
+        projection = self.get_projection() if wrapped else None
+        self._projection = projection
         q = self.base_query
+        if projection is not None:
+            columns = [getattr(self.model, name) for name in projection]
+            bundle = Bundle(self.item_key, *columns, single_entity=True)
+            q = q.with_entities(bundle)
         if self.filtering_enabled:
             q = self.apply_filters(q)
         if self.ordering_enabled:
             q = self.apply_ordering(q)
         if self.pagination_enabled:
             q, pagination_data = self.apply_pagination(q)
-            if pagination_data is not None:
-                data["pagination_data"] = pagination_data
-        q = self.apply_options(q)
-        items = q.all()
+        if projection is None:
+            requested_fields = self.get_requested_fields() if wrapped else None
+            q = self.apply_options(q, requested_fields=requested_fields)
+        if wrapped and pagination_data is None and self.can_stream_items():
+            items = q.yield_per(self.stream_batch_size)
+        else:
+            items = q.all()
+        if pagination_data is not None:
+            items = self.process_paginated_items(q, items, pagination_data)
+            data["pagination_data"] = pagination_data
         if not wrapped:
             return items
-        items = [self.extract_fields(item) for item in items]
-        items = [self.process_item(item) for item in items]
-        data[self.key] = items
+        if projection is None:
+            items = map(self.extract_fields, items)
+        else:
+            items = (dict(zip(projection, row)) for row in items)
+        # Items only need to be processed if there's an item processor
+        # or process_item() has been overridden.
+        process_item = self.process_item
+        overridden = process_item.__func__ is not SQLAlchemyResource.process_item
+        if self.item_processor or overridden:
+            items = map(process_item, items)
+        data[self.key] = list(items)
         return data
 
+    def get_projection(self):
+        """Get names of columns to select instead of ORM instances.
+
+        When ``use_core_for_projection`` is set and all of the response
+        fields are column attributes, the names of those columns are
+        returned in column order. Otherwise, ``None`` is returned and
+        ORM instances will be loaded as usual.
+
+        .. note:: When columns are selected directly, eager loading
+            options aren't applied and :meth:`extract_fields` isn't
+            called. Items are still passed to :meth:`process_item`.
+
+        """
+        if not self.use_core_for_projection:
+            return None
+        if not self._has_static_response_fields():
+            return None
+        fields = self.get_response_fields(None)
+        column_attrs = self.column_attrs
+        if not fields or not all(name in column_attrs for name in fields):
+            return None
+        return tuple(name for name in column_attrs if name in fields)
+
+    def can_stream_items(self):
+        """Can items be streamed from the database in batches?"""
+        if not self.stream_batch_size:
+            return False
+        if self.joined_load_with:
+            default_strategy = self.loader_strategy
+            for item in self.joined_load_with:
+                if isinstance(item, tuple):
+                    strategy = item[1]
+                else:
+                    strategy = default_strategy
+                if strategy == "joined":
+                    return False
+        return True
+
     def post(self):
         """Add item to container."""
         data = extract_data(self.request)
@@ -412,12 +763,20 @@ class SQLAlchemyContainerResource(SQLAlchemyResource):
 
             a = 1 and b in ('1', '2') and c < 4
 
+        To combine filters with ``or`` instead, include
+        ``"$operator": "or"``. This is passed through as is (in lower
+        case) rather than being converted to a :class:`FilterSpec`.
+
         .. note:: Filters are extracted from ``request.GET`` by default.
             Pass a different source via ``params`` if necessary (see
             :func:`get_params` for more details).
 
         """
         request = self.request
+        if params is None:
+            params = request.GET
+        if "filters" not in params:
+            return {}
         filters = get_param(
             request,
             "filters",
@@ -430,6 +789,13 @@ class SQLAlchemyContainerResource(SQLAlchemyResource):
         supported_operators = self.filtering_supported_operators
         processed_filters = {}
         for spec, value in filters.items():
+            if spec == "$operator":
+                if not isinstance(value, str):
+                    raise exception_response(
+                        400, detail=f"Unsupported boolean operator: {value!r}"
+                    )
+                processed_filters[spec] = value.lower()
+                continue
             name, *operator = spec.split(" ", 1)
             if operator:
                 operator = operator[0].lower()
@@ -453,6 +819,7 @@ class SQLAlchemyContainerResource(SQLAlchemyResource):
         if not ordering:
             return q
 
+        model = self.model
         order_by = []
         for item in ordering:
             if isinstance(item, str):
@@ -461,7 +828,7 @@ class SQLAlchemyContainerResource(SQLAlchemyResource):
                     desc = True
                 else:
                     desc = False
-                item = getattr(self.model, item)
+                item = getattr(model, item)
                 if desc:
                     item = item.desc()
             order_by.append(item)
@@ -473,40 +840,116 @@ class SQLAlchemyContainerResource(SQLAlchemyResource):
         request = self.request
         page = get_param(request, "page", int, default=1)
 
-        page_size = get_param(request, "page_size", default=None)
+        page_size = get_param(
+            request,
+            "page_size",
+            parse_page_size,
+            convert_blank_to_none=False,
+            default=self.pagination_default_page_size,
+        )
 
         # XXX: Page size "*" disables pagination
-        if page_size == "*":
+        if page_size is None:
             return q, None
 
-        page_size = get_param(
-            request, "page_size", int, default=self.pagination_default_page_size
-        )
-
         if page < 1:
             page = 1
 
-        if self.pagination_max_page_size and page_size > self.pagination_max_page_size:
-            page_size = self.pagination_max_page_size
+        max_page_size = self.pagination_max_page_size
+        if max_page_size and page_size > max_page_size:
+            page_size = max_page_size
+
+        strategy = self.pagination_count_strategy
+        if strategy not in ("window", "separate", "none"):
+            raise ValueError(f"Unknown pagination count strategy: {strategy!r}")
+
+        if strategy == "window":
+            if q._distinct:
+                # COUNT(*) OVER () is evaluated before DISTINCT, so it
+                # would count duplicate rows
+                strategy = "separate"
+            elif self._projection is None and len(q.column_descriptions) > 1:
+                # Only single-entity queries can have the count column
+                # added. A projected query always has a single entity.
+                strategy = "separate"
+
+        self._window_count_added = strategy == "window"
 
-        count = q.count()
-        num_pages = ceiling(count / page_size)
         offset = (page - 1) * page_size
 
-        q = q.offset(offset)
-        q = q.limit(page_size)
+        if strategy == "window":
+            # Count is computed by process_paginated_items()
+            count = None
+            q = q.add_columns(func.count().over().label(WINDOW_COUNT_LABEL))
+            q = q.offset(offset)
+            q = q.limit(page_size)
+        elif strategy == "separate":
+            count = q.count()
+            q = q.offset(offset)
+            q = q.limit(page_size)
+        else:
+            # Fetch an extra item to see if there's a next page
+            count = None
+            q = q.offset(offset)
+            q = q.limit(page_size + 1)
+
+        pagination_data = self.get_pagination_data(page, page_size, count)
+        return q, pagination_data
+
+    def process_paginated_items(self, q, items, pagination_data):
+        """Process items returned from a paginated query.
+
+        Depending on the ``pagination_count_strategy``, this extracts
+        the total count from the query results or trims the extra item
+        fetched to check for a next page. ``pagination_data`` is
+        updated accordingly. Returns the items for the current page.
 
-        pagination_data = {
+        """
+        strategy = self.pagination_count_strategy
+        if not (self._window_count_added or strategy == "none"):
+            return items
+        page = pagination_data["current_page"]
+        page_size = pagination_data["page_size"]
+        if self._window_count_added:
+            if items:
+                count = items[0][-1]
+            else:
+                # Past the last page, so there's no row to get the
+                # count from.
+                count = q.limit(None).offset(None).count()
+            items = [item[0] for item in items]
+            pagination_data.update(self.get_pagination_data(page, page_size, count))
+        elif strategy == "none":
+            has_next_page = len(items) > page_size
+            if has_next_page:
+                items = items[:page_size]
+            else:
+                pagination_data["next_page"] = page
+        return items
+
+    def get_pagination_data(self, page, page_size, count):
+        """Get pagination data for page.
+
+        If ``count`` is ``None``, the number of pages will be ``None``
+        too. Otherwise, the next page will be the current page when
+        there isn't a next page.
+
+        """
+        if count is None:
+            num_pages = None
+            next_page = page + 1
+        else:
+            num_pages = -(-count // page_size) if page_size else 0
+            next_page = page + 1 if page < num_pages else page
+        return {
             "pages": num_pages,
             "current_page": page,
-            "previous_page": 1 if page == 1 else page - 1,
-            "next_page": page + 1,
+            "previous_page": max(1, page - 1),
+            "next_page": next_page,
             "page_size": page_size,
             "count": count,
         }
 
-        return q, pagination_data
-
 
 class SQLAlchemyItemResource(SQLAlchemyResource):
 
@@ -531,12 +974,8 @@ class SQLAlchemyItemResource(SQLAlchemyResource):
 
     def get(self, *, wrapped=True):
         """Get item."""
-        q = self.base_query
-        q = self.apply_filters(q)
-        q = self.apply_options(q)
-        try:
-            item = q.one()
-        except NoResultFound:
+        item = self._get_or_none(wrapped=wrapped)
+        if item is None:
             filters = self.get_filters()
             detail = f"No item found for filters: {filters!r}"
             raise exception_response(404, detail=detail)
@@ -561,10 +1000,7 @@ class SQLAlchemyItemResource(SQLAlchemyResource):
         updated. Otherwise, a new item will be created.
 
         """
-        try:
-            item = self.get(wrapped=False)
-        except HTTPNotFound:
-            item = None
+        item = self._get_or_none()
         data = extract_data(self.request)
         if item is None:
             item = self.model(**data)
@@ -575,14 +1011,25 @@ class SQLAlchemyItemResource(SQLAlchemyResource):
                 setattr(item, name, value)
         return {self.key: item}
 
+    def _get_or_none(self, *, wrapped=False):
+        # Get item or None if it doesn't exist. When the item will be
+        # wrapped, only the relationships that will be included in the
+        # response are loaded eagerly.
+        q = self.base_query
+        q = self.apply_filters(q)
+        requested_fields = self.get_requested_fields() if wrapped else None
+        q = self.apply_options(q, requested_fields=requested_fields)
+        return q.one_or_none()
+
     def get_filters(self, *, params=None):
         request = self.request
         params = params or request.matchdict
         filters = {}
         for name, value in params.items():
-            try:
-                value = json.loads(value)
-            except ValueError:
-                pass
+            if not (isinstance(value, str) and is_plain_identifier(value)):
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass
             filters[name] = FilterSpec("__eq__", value)
         return filters
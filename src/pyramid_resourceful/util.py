@@ -1,5 +1,4 @@
 import functools
-import posixpath
 import re
 from typing import Any, Dict, List, Sequence, Union
 
@@ -11,40 +10,82 @@ NOT_SET = type("NOT_SET", (), {"__bool__": (lambda self: False)})()
 """Represents the complete absence of a value."""
 
 
+BOOL_VALUES = {"1": True, "true": True, "0": False, "false": False}
+"""Strings accepted by :func:`as_bool` (in lower case)."""
+
+
 def as_bool(string: str) -> bool:
     """Convert string to bool.
 
     Only the values "1", "true", "0", and "false" are accepted.
 
     """
-    string = string.lower()
-    if string in ("1", "true"):
-        return True
-    if string in ("0", "false"):
-        return False
-    raise ValueError('Expected value to be one of "1", "true", "0", or "false"')
+    try:
+        return BOOL_VALUES[string.lower()]
+    except KeyError:
+        raise ValueError(
+            'Expected value to be one of "1", "true", "0", or "false"'
+        ) from None
 
 
-def as_list(string, sep=",", strip=True):
-    """Convert string to list, splitting on comma by default."""
-    string = string.strip()
-    items = string.split(sep)
+def as_list(string, sep=",", strip=True, maxsplit=-1):
+    """Convert string to list, splitting on comma by default.
+
+    If ``maxsplit`` is specified, at most that many splits will be
+    done (see :meth:`str.split`).
+
+    """
+    items = string.strip().split(sep, maxsplit)
     if strip:
-        items = [item.strip() for item in items]
+        return [item.strip() for item in items]
     return items
 
 
+# Matches the positions in a camel case name where an underscore should
+# be inserted, within words and not next to an existing underscore:
+#
+# 1. Before an upper case letter that's followed by a lower case letter
+# 2. Between a lower case letter and an upper case letter
+CAMEL_CASE_RE = re.compile(r"(?<!\b)(?<!_)(?:(?=[A-Z][a-z])|(?<=[^\W_][a-z])(?=[A-Z]))")
+
+
+@functools.lru_cache(maxsize=512)
 def camel_to_underscore(name):
     """Convert camel case name to underscore name."""
-    name = re.sub(r"(?<!\b)(?<!_)([A-Z][a-z])", r"_\1", name)
-    name = re.sub(r"(?<!\b)(?<!_)([a-z])([A-Z])", r"\1_\2", name)
+    name = CAMEL_CASE_RE.sub("_", name)
     name = name.lower()
     return name
 
 
 def is_sequence(obj):
     """Is the object a non-string sequence?"""
-    return isinstance(obj, Sequence) and not isinstance(obj, str)
+    # NOTE: Common types are checked first to avoid the slower ABC check
+    if isinstance(obj, (list, tuple)):
+        return True
+    if isinstance(obj, (str, dict, int, float, type(None))):
+        return False
+    return isinstance(obj, Sequence)
+
+
+def join_path(path, *paths):
+    """Join URL path segments with slashes.
+
+    This is a simplified version of :func:`posixpath.join` for URL
+    paths, which are assumed to already be normalized. Segments should
+    be relative (i.e., *not* start with a slash)::
+
+        >>> join_path("/api", "items")
+        '/api/items'
+        >>> join_path("/api/", "items", "{id}")
+        '/api/items/{id}'
+
+    """
+    for segment in paths:
+        if not path or path.endswith("/"):
+            path = f"{path}{segment}"
+        else:
+            path = f"{path}/{segment}"
+    return path
 
 
 def merge_dicts(*dicts) -> Dict:
@@ -55,22 +96,35 @@ def merge_dicts(*dicts) -> Dict:
     as empty dicts.
 
     """
-    return functools.reduce(_merge_dicts, dicts, {})
-
-
-def _merge_dicts(a, b) -> Dict:
-    # Merge dict b into dict a
-    if a is None:
-        a = {} if b is None else b.__class__
-    if b is None:
-        b = a.__class__()
-    if not (isinstance(a, dict) and isinstance(b, dict)):
+    merged: Dict = {}
+    # Until a dict value is merged in, dicts can be merged with update()
+    has_dict_values = False
+    for d in dicts:
+        if d is None:
+            continue
+        if has_dict_values:
+            _merge_into(merged, d)
+        elif isinstance(d, dict):
+            merged.update(d)
+            has_dict_values = any(isinstance(v, dict) for v in d.values())
+        else:
+            raise TypeError(f"Expected two dicts; got {dict} and {d.__class__}")
+    return merged
+
+
+def _merge_into(a, b):
+    # Merge dict b into dict a. Nested dicts in a are copied before b's
+    # corresponding values are merged into them so that the dicts that
+    # were passed in aren't modified.
+    if not isinstance(b, dict):
         raise TypeError(f"Expected two dicts; got {a.__class__} and {b.__class__}")
     for k, v in b.items():
         if k in a and isinstance(a[k], dict):
-            v = merge_dicts(a[k], v)
+            nested = dict(a[k])
+            if v is not None:
+                _merge_into(nested, v)
+            v = nested
         a[k] = v
-    return a
 
 
 def obj_name_to_route_name(obj, prefix=None, suffix="_resource"):
@@ -107,19 +161,48 @@ def obj_name_to_route_name(obj, prefix=None, suffix="_resource"):
     return name
 
 
+@functools.lru_cache(maxsize=1024)
 def route_name_to_path(route_name, prefix=None, add_slash=False):
-    """Convert a route name to a URL path."""
+    """Convert a route name to a URL path.
+
+    Results are cached since route names form a small, fixed set::
+
+        >>> route_name_to_path("api.work_orders")
+        '/api/work-orders'
+        >>> route_name_to_path("work_orders", prefix="/api", add_slash=True)
+        '/api/work-orders/'
+
+    """
     path = route_name.replace(".", "/")
     path = path.replace("_", "-")
     path = path.strip("/")
     path = f"/{path}"
     if prefix:
-        path = posixpath.join(prefix, path.lstrip("/"))
+        path = join_path(prefix, path[1:])
     if add_slash:
         path = f"{path}/"
     return path
 
 
+def _extract_form_data(request):
+    # XXX: Blank values are converted to None
+    post = request.POST
+    if all(post.values()):
+        return dict(post.items())
+    return {k: v or None for k, v in post.items()}
+
+
+def _extract_json_data(request):
+    return request.json_body if request.body else None
+
+
+DATA_EXTRACTORS = {
+    "application/x-www-form-urlencoded": _extract_form_data,
+    "application/json": _extract_json_data,
+}
+"""Functions used by :func:`extract_data`, by content type."""
+
+
 def extract_data(request):
     """Extract request data from form or JSON data.
 
@@ -130,24 +213,57 @@ def extract_data(request):
     """
     content_type = request.content_type
 
-    if content_type == "application/x-www-form-urlencoded":
-        # XXX: Blank values are converted to None
-        data = {k: v or None for k, v in request.POST.items()}
-    elif content_type == "application/json":
-        data = request.json_body if request.body else None
-    else:
-        raise TypeError(f"Cannot extract data for content type: {content_type}")
+    try:
+        extractor = DATA_EXTRACTORS[content_type]
+    except KeyError:
+        message = f"Cannot extract data for content type: {content_type}"
+        raise TypeError(message) from None
+
+    data = extractor(request)
 
     # Remove CSRF token from data, if present
-    policy = request.registry.queryUtility(ICSRFStoragePolicy)
-    if policy:
-        options = request.registry.queryUtility(IDefaultCSRFOptions)
+    token = get_csrf_token_name(request.registry)
+    if token and data and token in data:
+        del data[token]
+
+    return data
+
+
+def get_csrf_token_name(registry):
+    """Get name of CSRF token param or ``None`` if CSRF isn't enabled.
+
+    The name is looked up once per registry and then cached on the
+    registry, since the CSRF config doesn't change once the app is
+    configured. Registries aren't hashable, so they can't be used as
+    cache keys.
+
+    """
+    try:
+        return registry.pyramid_resourceful_csrf_token_name
+    except AttributeError:
+        pass
+    token = None
+    if registry.queryUtility(ICSRFStoragePolicy):
+        options = registry.queryUtility(IDefaultCSRFOptions)
         if options:
             token = options.token
-            if token in data:
-                del data[token]
+    registry.pyramid_resourceful_csrf_token_name = token
+    return token
 
-    return data
+
+@functools.lru_cache(maxsize=256)
+def flag_regex(name):
+    """Get compiled regex that finds flag params with ``name``.
+
+    Params are delimited by "&" as in :func:`urllib.parse.parse_qsl`.
+    Each match is "" for a flag or "!" for a negated flag.
+
+    """
+    return re.compile(rf"(?:^|&)(!?){re.escape(name)}(?=&|$)")
+
+
+CONVERTER_ALIASES = {bool: as_bool, list: as_list}
+"""Converters used by :func:`get_param` in place of built in types."""
 
 
 def get_param(
@@ -212,25 +328,16 @@ def get_param(
     if params is None:
         params = request.GET
 
-    if converter is bool:
-        converter = as_bool
-    elif converter is list:
-        converter = as_list
+    converter = CONVERTER_ALIASES.get(converter, converter)
 
-    # Special handling of flags.
+    # Special handling of flags. The query string is only scanned for
+    # flags if the param name appears in it at all.
     if converter is as_bool and not multi:
-        maybe_flags = []
-        # NOTE: Splitting is based on urllib.parse.parse_qsl()
-        for param in request.query_string.split("&"):
-            if "=" not in param:
-                if param.startswith("!"):
-                    if param[1:].strip():
-                        maybe_flags.append(param)
-                elif param.strip():
-                    maybe_flags.append(param)
-        if maybe_flags:
-            count = maybe_flags.count(name)
-            negated_count = maybe_flags.count(f"!{name}")
+        query_string = request.query_string
+        if name in query_string:
+            matches = flag_regex(name).findall(query_string)
+            negated_count = matches.count("!")
+            count = len(matches) - negated_count
             if count == 1 and negated_count == 0:
                 return True
             if count == 0 and negated_count == 1:
@@ -241,26 +348,37 @@ def get_param(
             raise KeyError(f"Param not present: {name!r}")
         return default
 
-    def convert(v):
-        if strip:
-            v = v.strip()
-        if not v and convert_blank_to_none:
-            return None
-        if converter:
-            try:
-                v = converter(v)
-            except (TypeError, ValueError):
-                raise exception_response(
-                    400,
-                    detail=f"Could not parse parameter {name} with {converter}: {v!r}",
-                )
-        return v
-
     if multi:
         values = params.getall(name)
-        values = [convert(value) for value in values]
-        return values
-
-    value = params.getone(name)
-    value = convert(value)
-    return value
+    else:
+        values = [params.getone(name)]
+
+    if multi and converter and not (strip or convert_blank_to_none):
+        # Fast path when values only need to be passed to the converter.
+        # On failure, values are converted again below to find the value
+        # that couldn't be converted.
+        try:
+            return list(map(converter, values))
+        except (TypeError, ValueError):
+            pass
+
+    # NOTE: A single try block is used for all values rather than one
+    #       per value.
+    converted = []
+    value = None
+    try:
+        for value in values:
+            if strip:
+                value = value.strip()
+            if not value and convert_blank_to_none:
+                value = None
+            elif converter:
+                value = converter(value)
+            converted.append(value)
+    except (TypeError, ValueError):
+        raise exception_response(
+            400,
+            detail=f"Could not parse parameter {name} with {converter}: {value!r}",
+        )
+
+    return converted if multi else converted[0]
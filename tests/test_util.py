@@ -1,11 +1,71 @@
 from unittest import TestCase
 
+from pyramid.config import Configurator
+from pyramid.csrf import SessionCSRFStoragePolicy
+from pyramid.httpexceptions import HTTPBadRequest
 from pyramid.request import Request
 
-from pyramid_resourceful.util import get_param
+from pyramid_resourceful.util import (
+    camel_to_underscore,
+    extract_data,
+    get_param,
+    is_sequence,
+    join_path,
+    merge_dicts,
+)
+
+
+class TestCamelToUnderscore(TestCase):
+    def test_camel_to_underscore(self):
+        self.assertEqual(camel_to_underscore("Item"), "item")
+        self.assertEqual(camel_to_underscore("WorkOrder"), "work_order")
+        self.assertEqual(camel_to_underscore("workOrder"), "work_order")
+        self.assertEqual(camel_to_underscore("HTTPResponse"), "http_response")
+        self.assertEqual(camel_to_underscore("Work_Order"), "work_order")
+        self.assertEqual(camel_to_underscore("item_type"), "item_type")
+        self.assertEqual(camel_to_underscore("ABc"), "a_bc")
+        self.assertEqual(camel_to_underscore("aBcD"), "a_bc_d")
+        self.assertEqual(camel_to_underscore("1BbB"), "1_bb_b")
+        self.assertEqual(camel_to_underscore("bA_B"), "ba_b")
+
+
+class TestExtractData(TestCase):
+    def _make_request(self, registry):
+        request = Request.blank("/", POST={"a": "1", "b": "", "csrf_token": "xyz"})
+        request.registry = registry
+        return request
+
+    def test_extract_form_data(self):
+        request = self._make_request(Configurator().registry)
+        data = extract_data(request)
+        self.assertEqual(data, {"a": "1", "b": None, "csrf_token": "xyz"})
+
+    def test_extract_form_data_with_csrf_token(self):
+        config = Configurator()
+        config.set_csrf_storage_policy(SessionCSRFStoragePolicy())
+        config.set_default_csrf_options(require_csrf=False)
+        config.commit()
+        request = self._make_request(config.registry)
+        self.assertEqual(extract_data(request), {"a": "1", "b": None})
+        # Cached token name
+        request = self._make_request(config.registry)
+        self.assertEqual(extract_data(request), {"a": "1", "b": None})
 
 
 class TestGetParam(TestCase):
+    def test_convert(self):
+        request = Request.blank("/endpoint?a=1&b=1&b=+2+&b=&c=1&c=x")
+        self.assertEqual(get_param(request, "a", int), 1)
+        b = get_param(request, "b", int, multi=True, strip=True)
+        self.assertEqual(b, [1, 2, None])
+        self.assertRaises(HTTPBadRequest, get_param, request, "c", int, multi=True)
+        self.assertIsNone(get_param(request, "d", int, default=None))
+
+        kwargs = {"multi": True, "convert_blank_to_none": False}
+        self.assertEqual(get_param(request, "a", int, **kwargs), [1])
+        self.assertRaises(HTTPBadRequest, get_param, request, "b", int, **kwargs)
+        self.assertRaises(HTTPBadRequest, get_param, request, "c", int, **kwargs)
+
     def test_flags(self):
         request = Request.blank("/endpoint?a&!b&c&c&!d&!d&e=&!f=")
 
@@ -36,3 +96,34 @@ class TestGetParam(TestCase):
         f = get_param(request, "!f", bool)
         self.assertIsNone(f)
         self.assertRaises(KeyError, get_param, request, "f", bool)
+
+
+class TestIsSequence(TestCase):
+    def test_is_sequence(self):
+        for obj in ([], (), [1], range(2), b""):
+            self.assertTrue(is_sequence(obj))
+        for obj in ("", "abc", {}, 1, 1.0, None, {1}):
+            self.assertFalse(is_sequence(obj))
+
+
+class TestJoinPath(TestCase):
+    def test_join_path(self):
+        self.assertEqual(join_path("/a"), "/a")
+        self.assertEqual(join_path("/a", "b"), "/a/b")
+        self.assertEqual(join_path("/a/", "b"), "/a/b")
+        self.assertEqual(join_path("/a", "b", "{c}"), "/a/b/{c}")
+        self.assertEqual(join_path("/a", "b/{c}"), "/a/b/{c}")
+        self.assertEqual(join_path("/", "a"), "/a")
+        self.assertEqual(join_path("", "a"), "a")
+        self.assertEqual(join_path("/a", ""), "/a/")
+
+
+class TestMergeDicts(TestCase):
+    def test_merge_dicts(self):
+        a = {"a": 1, "n": {"x": 1, "y": 1}}
+        b = {"b": 2, "n": {"y": 2}}
+        merged = merge_dicts(a, None, b)
+        self.assertEqual(merged, {"a": 1, "b": 2, "n": {"x": 1, "y": 2}})
+        self.assertEqual(a, {"a": 1, "n": {"x": 1, "y": 1}})
+        self.assertEqual(merge_dicts(), {})
+        self.assertRaises(TypeError, merge_dicts, a, {"n": 1})
@@ -1,23 +1,39 @@
 import json
+from datetime import date, datetime
+from decimal import Decimal
 from unittest import TestCase
 
-from pyramid.config import Configurator
+from pyramid.config import ConfigurationError, Configurator
+from pyramid.decorator import reify
 from pyramid.events import NewRequest
-from pyramid.httpexceptions import HTTPNotFound, HTTPMethodNotAllowed
+from pyramid.httpexceptions import (
+    HTTPBadRequest,
+    HTTPMethodNotAllowed,
+    HTTPNotFound,
+)
+from pyramid.interfaces import IRendererFactory
+from pyramid.renderers import render
+from pyramid.request import Request
 from pyramid.testing import DummyRequest
+from webob.multidict import MultiDict
 
 try:
     import sqlalchemy  # noqa: F401
 except ImportError:
     pass
 else:
+    from sqlalchemy import event
     from sqlalchemy.engine import create_engine
+    from sqlalchemy.exc import InvalidRequestError
     from sqlalchemy.ext.declarative import declarative_base
-    from sqlalchemy.orm import Session
-    from sqlalchemy.schema import Column
+    from sqlalchemy.orm import Session, joinedload, relationship
+    from sqlalchemy.schema import Column, ForeignKey
     from sqlalchemy.types import Integer, String
 
+from pyramid_resourceful.renderers import JSONRenderer
+from pyramid_resourceful.settings import set_setting
 from pyramid_resourceful.sqlalchemy import (
+    FilterSpec,
     SQLAlchemyContainerResource,
     SQLAlchemyItemResource,
 )
@@ -30,7 +46,7 @@ class DummyRequest(DummyRequest):
         self.is_xhr = True
         self.registry.settings = {}
 
-    @property
+    @reify
     def json_body(self):
         return json.loads(self.body)
 
@@ -45,27 +61,78 @@ class Item(Base):
     id = Column(Integer, primary_key=True)
     value = Column(String, nullable=False)
 
+    attributes = relationship(
+        "Attribute", back_populates="item", cascade="all, delete-orphan"
+    )
+
+
+class Attribute(Base):
+
+    __tablename__ = "attribute"
+
+    id = Column(Integer, primary_key=True)
+    item_id = Column(Integer, ForeignKey("entity.id"), nullable=False)
+    name = Column(String, nullable=False)
+
+    item = relationship("Item", back_populates="attributes")
+
 
 class TestBase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The database is created once per test case class
+        cls.engine = create_engine("sqlite://")
+
+        # The pysqlite driver's own transaction handling has to be
+        # disabled for SAVEPOINTs to work.
+        @event.listens_for(cls.engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(cls.engine, "begin")
+        def on_begin(connection):
+            connection.exec_driver_sql("BEGIN")
+
+        Base.metadata.create_all(bind=cls.engine)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.dispose()
+
     def setUp(self):
-        # For each test, create a new database and populate it with a few
-        # things. Then create a resource instance to be used by the test.
-        engine = create_engine("sqlite://")
-        session = Session(bind=engine)
-        Base.metadata.create_all(bind=engine)
+        # For each test, start a transaction that's rolled back when the
+        # test is done and populate the database with a few things.
+        # Commits in tests only release savepoints, which are restarted
+        # as needed. Objects are expired when a savepoint ends, as they
+        # would be on a real commit (SQLAlchemy 1.4 doesn't do this for
+        # savepoints).
+        self.connection = self.engine.connect()
+        self.transaction = self.connection.begin()
+        session = Session(bind=self.connection)
+        session.begin_nested()
+
+        @event.listens_for(session, "after_transaction_end")
+        def restart_savepoint(session, transaction):
+            if transaction.nested and not transaction._parent.nested:
+                session.expire_all()
+                session.begin_nested()
+
         session.add_all(
             [
                 Item(id=1, value="one"),
                 Item(id=2, value="two"),
                 Item(id=3, value="three"),
+                Attribute(id=1, item_id=1, name="a"),
+                Attribute(id=2, item_id=1, name="b"),
             ]
         )
         session.commit()
         self.session = session
 
     def tearDown(self):
-        self.session.query(Item).delete()
-        self.session.commit()
+        self.session.close()
+        self.transaction.rollback()
+        self.connection.close()
 
     def make_request(self, json_body=None, **kwargs):
         if json_body:
@@ -112,6 +179,329 @@ class TestSQLAlchemyContainerResource(TestBase):
         items = data["items"]
         self.assertEqual(3, len(items))
 
+    def test_get_with_eager_loading(self):
+        for joined_load_with in (
+            [Item.attributes],
+            [(Item.attributes, "joined")],
+            [(Item.attributes, "selectin")],
+        ):
+            params = MultiDict([("field", "id"), ("field", "attributes.name")])
+            request = self.make_request(params=params)
+            resource = SQLAlchemyContainerResource(
+                request, Item, joined_load_with=joined_load_with
+            )
+            data = resource.get()
+            items = data["items"]
+            self.assertEqual(3, len(items))
+            self.assertEqual(
+                items[0], {"id": 1, "attributes": [{"name": "a"}, {"name": "b"}]}
+            )
+            self.assertEqual(items[1], {"id": 2, "attributes": []})
+
+    def test_get_unpaginated_with_joinedload_in_base_query(self):
+        base_query = self.session.query(Item).options(joinedload(Item.attributes))
+        params = MultiDict(page_size="*")
+        request = self.make_request(params=params)
+        resource = SQLAlchemyContainerResource(request, Item, base_query=base_query)
+        self.assertFalse(resource.can_stream_items())
+        items = resource.get()["items"]
+        self.assertEqual(3, len(items))
+
+    def test_get_streamed_with_eager_loading(self):
+        class Resource(SQLAlchemyContainerResource):
+            stream_batch_size = 1
+
+        for joined_load_with, streamed in (
+            ([Item.attributes], True),
+            ([(Item.attributes, "joined")], False),
+        ):
+            params = MultiDict([("field", "id"), ("field", "attributes.name")])
+            request = self.make_request(params=params)
+            resource = Resource(
+                request,
+                Item,
+                joined_load_with=joined_load_with,
+                pagination_enabled=False,
+            )
+            self.assertEqual(resource.can_stream_items(), streamed)
+            items = resource.get()["items"]
+            self.assertEqual(3, len(items))
+            self.assertEqual(
+                items[0], {"id": 1, "attributes": [{"name": "a"}, {"name": "b"}]}
+            )
+
+    def test_get_with_item_processor(self):
+        def item_processor(resource, model, item, request):
+            return {"id": item["id"] * 10}
+
+        request = self.make_request(params=MultiDict(field="id"))
+        set_setting(request.registry.settings, "item_processor", item_processor)
+        resource = SQLAlchemyContainerResource(request, Item)
+        items = resource.get()["items"]
+        self.assertEqual(items, [{"id": 10}, {"id": 20}, {"id": 30}])
+
+        class Resource(SQLAlchemyContainerResource):
+            def process_item(self, item):
+                return item["id"]
+
+        request = self.make_request(params=MultiDict(field="id"))
+        resource = Resource(request, Item)
+        self.assertEqual(resource.get()["items"], [1, 2, 3])
+
+    def test_get_with_fields(self):
+        params = MultiDict(fields="id,attributes.id,attributes.name")
+        request = self.make_request(params=params)
+        resource = SQLAlchemyContainerResource(request, Item)
+        items = resource.get()["items"]
+        self.assertEqual(
+            items[0],
+            {"id": 1, "attributes": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]},
+        )
+
+    def test_get_with_related_fields(self):
+        params = MultiDict(
+            [("field", "*"), ("field", "item.id"), ("field", "item.value")]
+        )
+        request = self.make_request(params=params)
+        resource = SQLAlchemyContainerResource(request, Attribute)
+        items = resource.get()["items"]
+        self.assertEqual(
+            items[0],
+            {"id": 1, "item_id": 1, "name": "a", "item": {"id": 1, "value": "one"}},
+        )
+
+    def _get_filtered(self, filters):
+        params = MultiDict(filters=json.dumps(filters))
+        resource = self.make_resource(params=params)
+        return [item["id"] for item in resource.get()["items"]]
+
+    def test_get_filtered(self):
+        self.assertEqual([1], self._get_filtered({"value": "one"}))
+        self.assertEqual([2, 3], self._get_filtered({"id >": 1}))
+        self.assertEqual([1, 3], self._get_filtered({"id": [1, 3]}))
+        self.assertEqual([2], self._get_filtered({"id >": 1, "value like": "t%o"}))
+        # Repeated to use cached filter operations
+        self.assertEqual([2, 3], self._get_filtered({"id >": 1}))
+
+    def test_get_filtered_with_boolean_operator(self):
+        filters = {"id": 1, "value": "two"}
+        self.assertEqual([], self._get_filtered({**filters, "$operator": "and"}))
+        self.assertEqual([1, 2], self._get_filtered({**filters, "$operator": "OR"}))
+        for operator in ("xor", 1):
+            self.assertRaises(
+                HTTPBadRequest, self._get_filtered, {**filters, "$operator": operator}
+            )
+
+    def test_get_filtered_with_upper_case_boolean_operator_from_get_filters(self):
+        class Resource(SQLAlchemyContainerResource):
+            def get_filters(self):
+                return {
+                    "id": FilterSpec("__eq__", 1),
+                    "value": FilterSpec("__eq__", "two"),
+                    "$operator": "OR",
+                }
+
+        request = self.make_request()
+        resource = Resource(request, Item)
+        items = resource.get()["items"]
+        self.assertEqual([1, 2], [item["id"] for item in items])
+
+    def test_get_with_filter_converters(self):
+        params = MultiDict(filters=json.dumps({"id": ["1", "3"], "value": "ONE"}))
+        request = self.make_request(params=params)
+        resource = SQLAlchemyContainerResource(
+            request, Item, filter_converters={"id": int, "value": str.lower}
+        )
+        filters = resource.convert_filters(resource.get_filters(), {"id": int})
+        self.assertEqual(filters["id"], FilterSpec("in_", [1, 3]))
+        self.assertEqual([1], [item["id"] for item in resource.get()["items"]])
+
+    def test_get_with_skipped_filters(self):
+        params = MultiDict(filters=json.dumps({"id >": 1}))
+        request = self.make_request(params=params)
+        resource = SQLAlchemyContainerResource(request, Item, filters_to_skip=["id"])
+        self.assertEqual(3, len(resource.get()["items"]))
+
+    def test_get_filtered_by_unknown_column(self):
+        self.assertRaises(HTTPBadRequest, self._get_filtered, {"pants": 1})
+
+    def test_get_filtered_by_unsupported_operator(self):
+        self.assertRaises(HTTPBadRequest, self._get_filtered, {"id ~": 1})
+
+    def _get_page(self, strategy, page, page_size=2, **kwargs):
+        params = MultiDict(page=str(page), page_size=str(page_size))
+        request = self.make_request(params=params)
+        resource = SQLAlchemyContainerResource(
+            request, Item, pagination_count_strategy=strategy, **kwargs
+        )
+        return resource.get()
+
+    def test_get_paginated(self):
+        for strategy in ("window", "separate"):
+            data = self._get_page(strategy, 1)
+            self.assertEqual([1, 2], [item["id"] for item in data["items"]])
+            pagination_data = data["pagination_data"]
+            self.assertEqual(pagination_data["count"], 3)
+            self.assertEqual(pagination_data["pages"], 2)
+            self.assertEqual(pagination_data["current_page"], 1)
+            self.assertEqual(pagination_data["previous_page"], 1)
+            self.assertEqual(pagination_data["next_page"], 2)
+            self.assertEqual(pagination_data["page_size"], 2)
+
+            data = self._get_page(strategy, 2)
+            self.assertEqual([3], [item["id"] for item in data["items"]])
+            pagination_data = data["pagination_data"]
+            self.assertEqual(pagination_data["count"], 3)
+            self.assertEqual(pagination_data["previous_page"], 1)
+            self.assertEqual(pagination_data["next_page"], 2)
+
+            # Past the last page
+            data = self._get_page(strategy, 3)
+            self.assertEqual([], data["items"])
+            self.assertEqual(data["pagination_data"]["count"], 3)
+
+    def test_get_paginated_with_eager_loading(self):
+        data = self._get_page("window", 1, joined_load_with=[Item.attributes])
+        self.assertEqual([1, 2], [item["id"] for item in data["items"]])
+        self.assertEqual(data["pagination_data"]["count"], 3)
+
+    def test_get_paginated_with_distinct_base_query(self):
+        base_query = self.session.query(Item).join(Item.attributes).distinct()
+        for strategy in ("window", "separate"):
+            data = self._get_page(strategy, 1, base_query=base_query)
+            self.assertEqual([1], [item["id"] for item in data["items"]])
+            self.assertEqual(data["pagination_data"]["count"], 1)
+            self.assertEqual(data["pagination_data"]["pages"], 1)
+
+    def test_get_paginated_with_custom_pagination_data(self):
+        class Resource(SQLAlchemyContainerResource):
+            def apply_pagination(self, q):
+                return q.limit(2), {"limit": 2}
+
+        request = self.make_request()
+        resource = Resource(request, Item, pagination_count_strategy="separate")
+        data = resource.get()
+        self.assertEqual([1, 2], [item["id"] for item in data["items"]])
+        self.assertEqual(data["pagination_data"], {"limit": 2})
+
+    def test_get_paginated_without_count(self):
+        data = self._get_page("none", 1)
+        self.assertEqual([1, 2], [item["id"] for item in data["items"]])
+        pagination_data = data["pagination_data"]
+        self.assertIsNone(pagination_data["count"])
+        self.assertIsNone(pagination_data["pages"])
+        self.assertEqual(pagination_data["next_page"], 2)
+
+        data = self._get_page("none", 2)
+        self.assertEqual([3], [item["id"] for item in data["items"]])
+        self.assertEqual(data["pagination_data"]["next_page"], 2)
+
+    def test_get_unwrapped_paginated(self):
+        request = self.make_request(params=MultiDict(page_size="2"))
+        resource = SQLAlchemyContainerResource(request, Item)
+        items = resource.get(wrapped=False)
+        self.assertEqual([1, 2], [item.id for item in items])
+
+    def test_get_all_pages(self):
+        request = self.make_request(params=MultiDict(page_size="*"))
+        resource = SQLAlchemyContainerResource(request, Item)
+        data = resource.get()
+        self.assertEqual(3, len(data["items"]))
+        self.assertNotIn("pagination_data", data)
+
+    def test_get_with_blank_page_size(self):
+        request = self.make_request(params=MultiDict(page_size=""))
+        resource = SQLAlchemyContainerResource(request, Item)
+        self.assertRaises(HTTPBadRequest, resource.get)
+
+    def test_get_with_core_projection(self):
+        class Resource(SQLAlchemyContainerResource):
+            use_core_for_projection = True
+
+        for strategy in ("window", "separate", "none"):
+            params = MultiDict(fields="id,value", filters='{"id >": 1}', page_size="1")
+            request = self.make_request(params=params)
+            resource = Resource(request, Item, pagination_count_strategy=strategy)
+            self.assertEqual(resource.get_projection(), ("id", "value"))
+            data = resource.get()
+            self.assertEqual(data["items"], [{"id": 2, "value": "two"}])
+            self.assertEqual(data["pagination_data"]["next_page"], 2)
+
+        params = MultiDict(fields="id,attributes.name")
+        request = self.make_request(params=params)
+        resource = Resource(request, Item, pagination_enabled=False)
+        self.assertIsNone(resource.get_projection())
+        items = resource.get()["items"]
+        self.assertEqual(items[0]["attributes"], [{"name": "a"}, {"name": "b"}])
+
+        class PerItemResource(Resource):
+            def get_default_response_fields(self, item):
+                return {"id", "value"}
+
+        request = self.make_request()
+        resource = PerItemResource(request, Item, pagination_enabled=False)
+        self.assertIsNone(resource.get_projection())
+        items = resource.get()["items"]
+        self.assertEqual(items[0], {"id": 1, "value": "one"})
+
+    def test_get_skips_eager_loading_of_unrequested_fields(self):
+        request = self.make_request(params=MultiDict(field="id"))
+        resource = SQLAlchemyContainerResource(
+            request,
+            Item,
+            joined_load_with=[(Item.attributes, "joined")],
+            raise_on_lazy_load=True,
+        )
+        data = resource.get()
+        self.assertEqual(data["items"][0], {"id": 1})
+        self.assertNotIn("attributes", resource.get_requested_fields())
+
+    def test_get_with_per_item_response_fields(self):
+        class Resource(SQLAlchemyContainerResource):
+            def get_default_response_fields(self, item):
+                fields = {"id", "value"}
+                if item.id == 1:
+                    fields.add("attributes")
+                return fields
+
+        request = self.make_request()
+        resource = Resource(request, Item)
+        self.assertIsNone(resource.get_requested_fields())
+        items = resource.get()["items"]
+        self.assertEqual(len(items[0]["attributes"]), 2)
+        self.assertNotIn("attributes", items[1])
+
+    def test_get_with_extract_fields_override(self):
+        class Resource(SQLAlchemyContainerResource):
+            def extract_fields(self, item, fields=None):
+                data = super().extract_fields(item, fields)
+                data["num_attributes"] = len(item.attributes)
+                return data
+
+        request = self.make_request(params=MultiDict(field="id"))
+        resource = Resource(
+            request,
+            Item,
+            joined_load_with=[(Item.attributes, "joined")],
+            raise_on_lazy_load=True,
+        )
+        self.assertIsNone(resource.get_requested_fields())
+        items = resource.get()["items"]
+        self.assertEqual(items[0], {"id": 1, "num_attributes": 2})
+
+    def test_get_raises_on_lazy_load(self):
+        params = MultiDict([("field", "id"), ("field", "attributes.name")])
+        request = self.make_request(params=params)
+        resource = SQLAlchemyContainerResource(request, Item, raise_on_lazy_load=True)
+        self.assertRaises(InvalidRequestError, resource.get)
+
+    def test_get_with_unknown_loader_strategy(self):
+        request = self.make_request()
+        resource = SQLAlchemyContainerResource(
+            request, Item, joined_load_with=[(Item.attributes, "pants")]
+        )
+        self.assertRaises(ValueError, resource.get)
+
 
 class TestSQLAlchemyItemResource(TestBase):
     def make_resource(self, **request_kwargs):
@@ -130,6 +520,13 @@ class TestSQLAlchemyItemResource(TestBase):
         resource = self.make_resource(matchdict={"id": "42"})
         self.assertRaises(HTTPNotFound, resource.get)
 
+    def test_get_filters(self):
+        matchdict = {"a": "1", "b": "slug-like_value", "c": "null", "d": '"x"'}
+        resource = self.make_resource(matchdict=matchdict)
+        filters = resource.get_filters()
+        values = {name: spec.value for name, spec in filters.items()}
+        self.assertEqual(values, {"a": 1, "b": "slug-like_value", "c": None, "d": "x"})
+
     def test_update(self):
         item = self.session.query(Item).get(1)
         self.assertEqual("one", item.value)
@@ -338,6 +735,48 @@ class TestAddResources(TestCase):
         )
         self.assertEqual(12, config.add_view.count)
 
+    def test_add_resource_with_allowed_methods(self):
+        config = self._make_config()
+        info = config.add_resource(
+            SQLAlchemyContainerResource,
+            resource_args={
+                "model": Item,
+            },
+            allowed_methods=["get"],
+        )
+        self.assertEqual(("GET",), info.allowed_methods)
+        self.assertEqual(12, config.add_view.count)
+
+    def test_resource_factory(self):
+        config = self._make_config()
+        config.add_resource(
+            SQLAlchemyContainerResource,
+            name="items",
+            resource_args={
+                "model": Item,
+            },
+            acl=["ACL"],
+        )
+        route = config.get_routes_mapper().get_route("items")
+        request = DummyRequest(dbsession=Session(bind=create_engine("sqlite://")))
+        resource = route.factory(request)
+        self.assertIsInstance(resource, SQLAlchemyContainerResource)
+        self.assertIs(resource.model, Item)
+        self.assertEqual(resource.__acl__, ["ACL"])
+        self.assertEqual(resource.allowed_methods, ("GET", "OPTIONS", "POST"))
+
+    def test_add_resource_with_unknown_allowed_method(self):
+        config = self._make_config()
+        self.assertRaises(
+            ConfigurationError,
+            config.add_resource,
+            SQLAlchemyContainerResource,
+            resource_args={
+                "model": Item,
+            },
+            allowed_methods=["delete"],
+        )
+
     def test_add_resources(self):
         config = self._make_config()
         resource_args = {"model": Item}
@@ -403,6 +842,66 @@ class TestAddResources(TestCase):
                     )
 
 
+class TestJSONAdapters(TestCase):
+    def _make_config(self):
+        config = Configurator()
+        config.include("pyramid_resourceful")
+        config.add_json_adapters()
+        config.commit()
+        return config
+
+    def _render(self, config, value):
+        request = DummyRequest()
+        request.registry = config.registry
+        return json.loads(render("json", value, request=request))
+
+    def test_default_adapters(self):
+        config = self._make_config()
+        data = self._render(
+            config,
+            {
+                "date": date(2021, 11, 7),
+                "datetime": datetime(2021, 11, 7, 12, 30),
+                "decimal": Decimal("1.50"),
+            },
+        )
+        self.assertEqual(data["date"], "2021-11-07")
+        self.assertEqual(data["datetime"], "2021-11-07T12:30:00")
+        self.assertEqual(data["decimal"], "1.50")
+
+    def test_subclass_uses_adapter_for_base_class(self):
+        class MyDate(date):
+            pass
+
+        config = self._make_config()
+        data = self._render(config, {"date": MyDate(2021, 11, 7)})
+        self.assertEqual(data["date"], "2021-11-07")
+
+    def test_existing_adapters_are_retained(self):
+        class Thing:
+            pass
+
+        config = Configurator()
+        config.include("pyramid_resourceful")
+        config.add_json_adapter((Thing, lambda obj, request: "thing"))
+        config.add_json_adapters()
+        config.commit()
+        renderer = config.registry.getUtility(IRendererFactory, "json")
+        self.assertIsInstance(renderer, JSONRenderer)
+        data = self._render(config, {"thing": Thing(), "date": date(2021, 11, 7)})
+        self.assertEqual(data, {"thing": "thing", "date": "2021-11-07"})
+
+    def test_dunder_json_takes_precedence_over_adapter(self):
+        class Thing:
+            def __json__(self, request):
+                return "from __json__"
+
+        config = self._make_config()
+        config.add_json_adapter((Thing, lambda obj, request: "from adapter"))
+        data = self._render(config, {"thing": Thing()})
+        self.assertEqual(data, {"thing": "from __json__"})
+
+
 class TestPOSTTunneling(TestCase):
     def _make_app(self):
         config = Configurator()
@@ -464,6 +963,30 @@ class TestPOSTTunneling(TestCase):
         app.registry.notify(NewRequest(request))
         self._assert_after(request, "DELETE")
 
+    def _make_json_request(self, **kwargs):
+        return Request.blank(
+            "/r",
+            method="POST",
+            body=b'{"a": 1}',
+            content_type="application/json",
+            **kwargs,
+        )
+
+    def test_json_post_without_tunnel(self):
+        app = self._make_app()
+        request = self._make_json_request()
+        app.registry.notify(NewRequest(request))
+        self.assertEqual("POST", request.method)
+        self.assertEqual(request.json_body, {"a": 1})
+
+    def test_json_put_using_header(self):
+        app = self._make_app()
+        request = self._make_json_request(headers={"X-HTTP-Method-Override": "PUT"})
+        self._assert_before(request)
+        app.registry.notify(NewRequest(request))
+        self._assert_after(request, "PUT")
+        self.assertEqual(request.json_body, {"a": 1})
+
     def test_unknown_method_using_param(self):
         app = self._make_app()
         request = DummyRequest(params={"$method": "PANTS"}, method="POST")